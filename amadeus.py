@@ -1,8 +1,37 @@
 
 BASE_URL = "https://test.api.amadeus.com"
+import heapq
+import math
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
 from schema import ACTIVITY_CATEGORIES
 
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used instead
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:  # optional, API responses are simply not cached
+    requests_cache = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional C extension, falls back to a keyword scan
+    ahocorasick = None
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -11,13 +40,103 @@ import os
 AMADEUS_API_KEY = os.getenv("AMADEUS_API_KEY")
 AMADEUS_API_SECRET = os.getenv("AMADEUS_API_SECRET")
 
+CACHE_DIR = os.path.expanduser("~/.cache/travel_planner")
+
+# Per-endpoint TTLs (seconds) of the HTTP cache, matching how often each
+# endpoint's data changes. Any other URL is never cached.
+API_CACHE_TTLS = {
+    "*/v1/reference-data/locations/hotels/by-geocode": 3600,
+    "*/v1/shopping/activities": 1800,
+    "*/v3/shopping/hotel-offers": 60,
+}
+
+def _make_session():
+    """Cached session when requests-cache is usable, plain session otherwise.
+
+    Like the geocode disk cache, the HTTP cache is best effort: an unwritable
+    cache location only costs the cache.
+    """
+    if requests_cache is not None:
+        try:
+            return requests_cache.CachedSession(
+                os.path.join(CACHE_DIR, "amadeus_cache"),
+                backend="sqlite",
+                expire_after=requests_cache.DO_NOT_CACHE,
+                urls_expire_after=API_CACHE_TTLS,
+                allowable_methods=("GET",),
+            )
+        except (OSError, sqlite3.Error):
+            pass
+    return requests.Session()
+
+# One pooled session for every Amadeus/Nominatim call, so TCP+TLS
+# connections are reused instead of re-opened on each request.
+_SESSION = _make_session()
+_SESSION.headers.update({"User-Agent": "travel-planner-demo"})
+
+# Longest Retry-After (seconds) a rate-limited call waits before retrying
+MAX_RETRY_AFTER = 5
+
+
+class _BoundedRetry(Retry):
+    """Retry that honours Retry-After, but gives up instead of waiting
+    longer than MAX_RETRY_AFTER for the server."""
+
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        if response is not None:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                raise MaxRetryError(_pool, url, ResponseError(
+                    f"Retry-After of {retry_after:g}s exceeds {MAX_RETRY_AFTER}s"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Retry failed connects and transient 5xx answers with exponential
+    # backoff, but never a read timeout: a stalled server is not retried.
+    # A 429 is only retried when its Retry-After asks for at most
+    # MAX_RETRY_AFTER seconds, so a call (token POST included) is bounded
+    # at roughly 50 s and never re-sent blindly into the rate limit.
+    max_retries=_BoundedRetry(
+        total=2,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+    ),
+)
+_SESSION.mount("https://", _ADAPTER)
+
+# (connect, read) timeout in seconds passed to every request
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Worker threads for independent network round-trips (token, geocode, ...).
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Amadeus access token as (token, expiry timestamp), shared by all threads.
+_token_cache = (None, 0.0)
+_token_lock = threading.Lock()
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry a token is renewed
+
+# Geocode results persisted across runs (Nominatim allows ~1 req/s).
+GEOCODE_CACHE_PATH = os.path.join(CACHE_DIR, "geocode.sqlite")
+GEOCODE_CACHE_TTL = 30 * 86400  # seconds
+
+def _parse_json(response):
+    """Decode a JSON response body, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 def search_flights():
     return """Flight search not implemented yet."""
 
 
 def search_activities(city, radius_km=3, activity_type="cultural"):
-    token = get_access_token()
-    lat, lon = geocode_city(city)
+    token, (lat, lon) = _token_and_coords(city)
 
     url = f"{BASE_URL}/v1/shopping/activities"
     headers = {
@@ -30,7 +149,7 @@ def search_activities(city, radius_km=3, activity_type="cultural"):
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
     except requests.exceptions.HTTPError as e:
@@ -41,20 +160,33 @@ def search_activities(city, radius_km=3, activity_type="cultural"):
         print("Request failed:", e)
         return []
 
-    activities = parse_activities(response.json())
+    activities = parse_activities(_parse_json(response))
+
+    # Preferred category first, then the others; both by name. The others
+    # are only ranked when there aren't enough preferred activities.
+    top = [a for a in activities if a.activity_type == activity_type]
+    top.sort(key=_activity_name)
+    del top[10:]
+    if len(top) < 10:
+        others = (a for a in activities if a.activity_type != activity_type)
+        top += heapq.nsmallest(10 - len(top), others, key=_activity_name)
 
-    # Sort categories by preferred activity
-    activities.sort(key=lambda a: (a["activity_type"] != activity_type, a["name"]))
+    return [a._asdict() for a in top]
 
-    return activities[:10]
+def _activity_name(activity):
+    return activity.name or ""
 
 def compare_options(city1: str, city2: str, compare_type: str):
     if compare_type not in ACTIVITY_CATEGORIES:
         return [], []
     
-    activities1 = search_activities(city1, activity_type=compare_type)
-    activities2 = search_activities(city2, activity_type=compare_type)
-    return activities1, activities2
+    # The two city searches are IO-bound and independent. They get their own
+    # pool: each search blocks on _IO_POOL jobs, so running them there too
+    # could starve it.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future1 = pool.submit(search_activities, city1, activity_type=compare_type)
+        future2 = pool.submit(search_activities, city2, activity_type=compare_type)
+        return future1.result(), future2.result()
 
 def request_information(city: str, entity_type: str):
     if entity_type not in ["hotels", "flights", "activities"]:
@@ -68,20 +200,55 @@ def request_information(city: str, entity_type: str):
         # Flights search not implemented
         return []
 
+# Frozen, pre-lowered view of ACTIVITY_CATEGORIES: ((category, keywords), ...).
+# Keywords are interned so every table below shares one object per keyword.
+_CATEGORIES_FROZEN = tuple(
+    (category, tuple(sys.intern(k.lower()) for k in keywords))
+    for category, keywords in ACTIVITY_CATEGORIES.items()
+)
+_CATEGORY_ORDER = tuple(category for category, _ in _CATEGORIES_FROZEN)
+
+def _build_keyword_map():
+    """Flat keyword -> category map in category order (first category wins on duplicates)."""
+    keyword_to_category = {}
+    for category, keywords in _CATEGORIES_FROZEN:
+        for k in keywords:
+            keyword_to_category.setdefault(k, category)
+    return keyword_to_category
+
+_KEYWORD_TO_CATEGORY = _build_keyword_map()
+
+def _build_activity_automaton():
+    """Aho-Corasick automaton mapping every keyword to its category rank."""
+    rank_of = {category: rank for rank, category in enumerate(_CATEGORY_ORDER)}
+    automaton = ahocorasick.Automaton()
+    for k, category in _KEYWORD_TO_CATEGORY.items():
+        automaton.add_word(k, rank_of[category])
+    automaton.make_automaton()
+    return automaton
+
+_ACTIVITY_AUTOMATON = _build_activity_automaton() if ahocorasick else None
+
 def classify_activity(name: str | None) -> str:
     if not name:
         return "general"
 
     name = name.lower()
-    for category, keywords in ACTIVITY_CATEGORIES.items():
-        if any(k in name for k in keywords):
+    if _ACTIVITY_AUTOMATON is not None:
+        # Single pass over the name; like the scan below, the first
+        # category (in ACTIVITY_CATEGORIES order) with a hit wins.
+        rank = min((r for _, r in _ACTIVITY_AUTOMATON.iter(name)), default=None)
+        return "general" if rank is None else _CATEGORY_ORDER[rank]
+
+    # Keywords are in category order, so the first hit is the right category
+    for k, category in _KEYWORD_TO_CATEGORY.items():
+        if k in name:
             return category
     return "general"
 
 
 def search_accomodation(city, radius_km=3, ratings="1,2,3,4,5", num_adults=1, start_date="YYYY-MM-DD", end_date="YYYY-MM-DD"):
-    token = get_access_token()
-    lat, lon = geocode_city(city)
+    token, (lat, lon) = _token_and_coords(city)
 
     url = f"{BASE_URL}/v1/reference-data/locations/hotels/by-geocode"
     headers = {
@@ -97,7 +264,7 @@ def search_accomodation(city, radius_km=3, ratings="1,2,3,4,5", num_adults=1, st
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
     except requests.exceptions.HTTPError as e:
@@ -108,13 +275,9 @@ def search_accomodation(city, radius_km=3, ratings="1,2,3,4,5", num_adults=1, st
         print("Request failed:", e)
         return []
 
-    hotels = parse_hotels_list(response.json())
-
-    hotels.sort(key=lambda h: h["distance"])
-
-    hotels = hotels[:10]
+    hotels = parse_hotels_list(_parse_json(response), limit=10)
 
-    ids = [hotel["hotelId"] for hotel in hotels]
+    ids = [hotel.hotelId for hotel in hotels]
 
     url = f"{BASE_URL}/v3/shopping/hotel-offers"
 
@@ -131,7 +294,7 @@ def search_accomodation(city, radius_km=3, ratings="1,2,3,4,5", num_adults=1, st
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = _SESSION.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
     except requests.exceptions.HTTPError as e:
@@ -143,105 +306,226 @@ def search_accomodation(city, radius_km=3, ratings="1,2,3,4,5", num_adults=1, st
         return []
 
     
-    rooms = parse_hotels_search(response.json())
+    rooms = parse_hotels_search(_parse_json(response))
 
-    rooms_by_id = {r["hotelId"]: r for r in rooms}
+    rooms_by_id = {r.hotelId: r for r in rooms}
 
     merged = [
-        {**h, **rooms_by_id[h["hotelId"]]}
+        {**h._asdict(), **rooms_by_id[h.hotelId]._asdict()}
         for h in hotels
-        if h["hotelId"] in rooms_by_id
+        if h.hotelId in rooms_by_id
     ]
 
     return merged
 
+def _token_and_coords(city):
+    """Fetch the access token and geocode the city concurrently (different hosts)."""
+    token = _cached_token()
+    if token is not None:
+        # Warm token: nothing to overlap, skip the thread hand-off
+        return token, geocode_city(city)
+
+    token_future = _IO_POOL.submit(get_access_token)
+    lat, lon = geocode_city(city)
+    return token_future.result(), (lat, lon)
+
+def _cached_token():
+    """Return the cached token if it is still fresh, otherwise None."""
+    token, expires_at = _token_cache
+    if token and time.time() < expires_at - TOKEN_REFRESH_MARGIN:
+        return token
+    return None
+
 def get_access_token():
-    url = f"{BASE_URL}/v1/security/oauth2/token"
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded"
-    }
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": AMADEUS_API_KEY,
-        "client_secret": AMADEUS_API_SECRET
-    }
+    """Return a cached Amadeus token, refreshing it shortly before it expires."""
+    global _token_cache
+
+    token = _cached_token()
+    if token is not None:
+        return token
+
+    # Double-checked: concurrent callers wait for a single refresh
+    with _token_lock:
+        token = _cached_token()
+        if token is not None:
+            return token
+
+        url = f"{BASE_URL}/v1/security/oauth2/token"
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": AMADEUS_API_KEY,
+            "client_secret": AMADEUS_API_SECRET
+        }
+
+        response = _SESSION.post(url, headers=headers, data=data, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
 
-    response = requests.post(url, headers=headers, data=data)
-    response.raise_for_status()
+        payload = _parse_json(response)
+        token = payload["access_token"]
+        _token_cache = (token, time.time() + payload.get("expires_in", 0))
 
-    return response.json()["access_token"]
+    return token
 
 def geocode_city(city):
+    """Return (lat, lon) for a city: memory cache -> disk cache -> Nominatim."""
+    return _geocode_cached(city.strip().casefold())
+
+@lru_cache(maxsize=2048)
+def _geocode_cached(city):
+    coords = _geocode_disk_get(city)
+    if coords is None:
+        coords = _geocode_remote(city)
+        _geocode_disk_set(city, coords)
+    return coords
+
+def _geocode_remote(city):
     url = "https://nominatim.openstreetmap.org/search"
     params = {
         "q": city,
         "format": "json",
         "limit": 1
     }
-    headers = {"User-Agent": "travel-planner-demo"}
-
-    r = requests.get(url, params=params, headers=headers)
+    r = _SESSION.get(url, params=params, timeout=REQUEST_TIMEOUT)
     r.raise_for_status()
-    data = r.json()
+    data = _parse_json(r)
 
     if not data:
         raise ValueError(f"City not found: {city}")
 
     return float(data[0]["lat"]), float(data[0]["lon"])
 
+def _geocode_db():
+    os.makedirs(os.path.dirname(GEOCODE_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(GEOCODE_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS geocode "
+        "(city TEXT PRIMARY KEY, lat REAL, lon REAL, expires REAL)"
+    )
+    return conn
+
+def _geocode_disk_get(city):
+    # The disk cache is best effort: any failure just means a network lookup.
+    try:
+        with closing(_geocode_db()) as conn:
+            row = conn.execute(
+                "SELECT lat, lon FROM geocode WHERE city = ? AND expires > ?",
+                (city, time.time()),
+            ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return (row[0], row[1]) if row else None
+
+def _geocode_disk_set(city, coords):
+    try:
+        with closing(_geocode_db()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?)",
+                (city, coords[0], coords[1], time.time() + GEOCODE_CACHE_TTL),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+# Parsed API records are kept as lightweight tuples and only turned into
+# dicts (via _asdict) for the results handed back to callers.
+class Activity(NamedTuple):
+    name: Optional[str]
+    description: Optional[str]
+    rating: Optional[str]
+    price: Optional[str]
+    currency: Optional[str]
+    activity_type: str
+
+
+class Hotel(NamedTuple):
+    name: Optional[str]
+    hotelId: Optional[str]
+    distance: Optional[float]
+
+
+class HotelOffer(NamedTuple):
+    hotelId: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    contact: Optional[str]
+    price: Optional[str]
+    currency: Optional[str]
+    description: Optional[str]
+    boardType: Optional[str]
+    cancellationPolicy: Optional[str]
+    paymentType: Optional[str]
+
+
+# Shared read-only defaults for missing sub-objects, so lookups on absent
+# keys don't allocate a throwaway {} / [] each time. Never mutate these.
+_EMPTY = {}
+_EMPTY_LIST = []
+
 def parse_activities(data):
     activities = []
 
-    for a in data.get("data", []):
-        activities.append({
-            "name": a.get("name"),
-            "description": a.get("shortDescription"),
-            "rating": a.get("rating"),
-            "price": a.get("price", {}).get("amount"),
-            "currency": a.get("price", {}).get("currencyCode"),
-            "activity_type": classify_activity(a.get("name"))
-        })
+    for a in data.get("data", _EMPTY_LIST):
+        price = a.get("price") or _EMPTY
+        activities.append(Activity(
+            name=a.get("name"),
+            description=a.get("shortDescription"),
+            rating=a.get("rating"),
+            price=price.get("amount"),
+            currency=price.get("currencyCode"),
+            activity_type=classify_activity(a.get("name")),
+        ))
 
     return activities
 
-def parse_hotels_list(data):
-    hotels = []
-
-    for a in data.get("data", []):
-        hotels.append({
-            "name": a.get("name"),
-            "hotelId": a.get("hotelId"),
-            "distance": a.get("distance", {}).get("value")
-            #"unit": a.get("distance").get("value")
-        })
+def _hotel_distance(hotel):
+    distance = (hotel.get("distance") or _EMPTY).get("value")
+    return math.inf if distance is None else distance
 
-    return hotels
+def parse_hotels_list(data, limit=None):
+    """Parse hotels sorted by distance; with a limit only the closest ones are parsed."""
+    raw = data.get("data", _EMPTY_LIST)
+    if limit is None:
+        closest = sorted(raw, key=_hotel_distance)
+    else:
+        closest = heapq.nsmallest(limit, raw, key=_hotel_distance)
+
+    return [
+        Hotel(
+            name=a.get("name"),
+            hotelId=a.get("hotelId"),
+            distance=(a.get("distance") or _EMPTY).get("value"),
+            #unit=a.get("distance").get("value"),
+        )
+        for a in closest
+    ]
 
 def parse_hotels_search(data):
     rooms = []
 
-    for a in data.get("data", []):
-        obj = {}
-
+    for a in data.get("data", _EMPTY_LIST):
         if not a.get("available", False):
             continue
 
-        # Hotel info
-        obj["hotelId"] = a.get("hotel", {}).get("hotelId")
-        obj["latitude"] = a.get("hotel", {}).get("latitude")
-        obj["longitude"] = a.get("hotel", {}).get("longitude")
-        obj["contact"] = a.get("hotel", {}).get("contact", {}).get("phone")
-
-        # Room info
-        offers = a.get("offers", [])
-        offer = offers[0] if offers else {}
-
-        obj["price"] = offer.get("price", {}).get("total")
-        obj["currency"] = offer.get("price", {}).get("currency")
-        obj["description"] = offer.get("roomInformation", {}).get("description")
-        obj["boardType"] = offer.get("boardType")
-        obj["cancellationPolicy"] = offer.get("policies", {}).get("refundable", {}).get("cancellationRefund")
-        obj["paymentType"] = offer.get("policies", {}).get("paymentType")
-
-        rooms.append(obj)
-    return rooms
\ No newline at end of file
+        hotel = a.get("hotel") or _EMPTY
+        offers = a.get("offers") or _EMPTY_LIST
+        offer = offers[0] if offers else _EMPTY
+        price = offer.get("price") or _EMPTY
+        policies = offer.get("policies") or _EMPTY
+
+        rooms.append(HotelOffer(
+            # Hotel info
+            hotelId=hotel.get("hotelId"),
+            latitude=hotel.get("latitude"),
+            longitude=hotel.get("longitude"),
+            contact=(hotel.get("contact") or _EMPTY).get("phone"),
+            # Room info
+            price=price.get("total"),
+            currency=price.get("currency"),
+            description=(offer.get("roomInformation") or _EMPTY).get("description"),
+            boardType=offer.get("boardType"),
+            cancellationPolicy=(policies.get("refundable") or _EMPTY).get("cancellationRefund"),
+            paymentType=policies.get("paymentType"),
+        ))
+    return rooms
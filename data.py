@@ -1,11 +1,17 @@
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, List
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, FrozenSet, Optional, List
 from typing import Literal
 
 # =============================================================================
 # BOOKING DATA CLASSES
 # =============================================================================
-@dataclass
+
+# Required slots per booking, in the order they are asked for
+_FLIGHT_REQUIRED = ("origin", "destination", "departure_date", "num_passengers", "budget_level")
+_ACCOMMODATION_REQUIRED = ("destination", "check_in_date", "check_out_date", "num_guests", "budget_level")
+_ACTIVITY_REQUIRED = ("destination", "activity_category", "budget_level")
+
+@dataclass(slots=True)
 class FlightBooking:
     """Self-contained data for flight booking."""
     origin: Optional[str] = None
@@ -16,32 +22,34 @@ class FlightBooking:
     budget_level: Optional[Literal["low", "medium", "high"]] = None
     completed: bool = False
 
+    # Slots that can be filled from NLU output / carryover (set below)
+    SLOT_NAMES: ClassVar[FrozenSet[str]]
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "origin": self.origin,
-            "destination": self.destination,
-            "departure_date": self.departure_date,
-            "return_date": self.return_date,
-            "num_passengers": self.num_passengers,
-            "budget_level": self.budget_level,
-            "completed": self.completed,
-        }
+        return {s: getattr(self, s) for s in _FLIGHT_FIELDS}
 
     def missing_slots(self) -> List[str]:
-        required = ["origin", "destination", "departure_date", "num_passengers", "budget_level"]
-        return [s for s in required if getattr(self, s, None) is None]
+        return [s for s in _FLIGHT_REQUIRED if getattr(self, s) is None]
+
+    def filled_slots(self) -> Dict[str, Any]:
+        return {s: v for s in _FLIGHT_FIELDS if (v := getattr(self, s)) is not None}
 
     def update(self, slots: Dict[str, Any]) -> None:
         for key, value in slots.items():
-            if hasattr(self, key) and value is not None:
+            if value is not None and key in self.SLOT_NAMES:
                 setattr(self, key, value)
 
     def has_any_data(self) -> bool:
-        return any([self.origin, self.destination, self.departure_date, 
-                    self.return_date, self.num_passengers, self.budget_level])
+        return bool(self.origin or self.destination or self.departure_date
+                    or self.return_date or self.num_passengers or self.budget_level)
+
 
+# All fields per booking, in declaration (and to_dict) order
+_FLIGHT_FIELDS = tuple(f.name for f in fields(FlightBooking))
+FlightBooking.SLOT_NAMES = frozenset(_FLIGHT_FIELDS) - {"completed"}
 
-@dataclass
+
+@dataclass(slots=True)
 class AccommodationBooking:
     """Self-contained data for accommodation booking."""
     destination: Optional[str] = None
@@ -51,30 +59,33 @@ class AccommodationBooking:
     budget_level: Optional[Literal["low", "medium", "high"]] = None
     completed: bool = False
 
+    # Slots that can be filled from NLU output / carryover (set below)
+    SLOT_NAMES: ClassVar[FrozenSet[str]]
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "destination": self.destination,
-            "check_in_date": self.check_in_date,
-            "check_out_date": self.check_out_date,
-            "num_guests": self.num_guests,
-            "budget_level": self.budget_level,
-            "completed": self.completed,
-        }
+        return {s: getattr(self, s) for s in _ACCOMMODATION_FIELDS}
 
     def missing_slots(self) -> List[str]:
-        required = ["destination", "check_in_date", "check_out_date", "num_guests", "budget_level"]
-        return [s for s in required if getattr(self, s, None) is None]
+        return [s for s in _ACCOMMODATION_REQUIRED if getattr(self, s) is None]
+
+    def filled_slots(self) -> Dict[str, Any]:
+        return {s: v for s in _ACCOMMODATION_FIELDS if (v := getattr(self, s)) is not None}
 
     def update(self, slots: Dict[str, Any]) -> None:
         for key, value in slots.items():
-            if hasattr(self, key) and value is not None:
+            if value is not None and key in self.SLOT_NAMES:
                 setattr(self, key, value)
 
     def has_any_data(self) -> bool:
-        return any([self.destination, self.check_in_date, self.check_out_date, self.num_guests, self.budget_level])
+        return bool(self.destination or self.check_in_date or self.check_out_date
+                    or self.num_guests or self.budget_level)
+
 
+_ACCOMMODATION_FIELDS = tuple(f.name for f in fields(AccommodationBooking))
+AccommodationBooking.SLOT_NAMES = frozenset(_ACCOMMODATION_FIELDS) - {"completed"}
 
-@dataclass
+
+@dataclass(slots=True)
 class ActivityBooking:
     """Self-contained data for activity booking."""
     destination: Optional[str] = None
@@ -82,32 +93,43 @@ class ActivityBooking:
     budget_level: Optional[Literal["low", "medium", "high"]] = None
     completed: bool = False
 
+    # Slots that can be filled from NLU output / carryover (set below)
+    SLOT_NAMES: ClassVar[FrozenSet[str]]
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "destination": self.destination,
-            "activity_category": self.activity_category,
-            "budget_level": self.budget_level,
-            "completed": self.completed,
-        }
+        return {s: getattr(self, s) for s in _ACTIVITY_FIELDS}
 
     def missing_slots(self) -> List[str]:
-        required = ["destination", "activity_category", "budget_level"]
-        return [s for s in required if getattr(self, s, None) is None]
+        return [s for s in _ACTIVITY_REQUIRED if getattr(self, s) is None]
+
+    def filled_slots(self) -> Dict[str, Any]:
+        return {s: v for s in _ACTIVITY_FIELDS if (v := getattr(self, s)) is not None}
 
     def update(self, slots: Dict[str, Any]) -> None:
         for key, value in slots.items():
-            if hasattr(self, key) and value is not None:
+            if value is not None and key in self.SLOT_NAMES:
                 setattr(self, key, value)
 
     def has_any_data(self) -> bool:
-        return any([self.destination, self.activity_category, self.budget_level])
+        return bool(self.destination or self.activity_category or self.budget_level)
+
+
+_ACTIVITY_FIELDS = tuple(f.name for f in fields(ActivityBooking))
+ActivityBooking.SLOT_NAMES = frozenset(_ACTIVITY_FIELDS) - {"completed"}
 
 
 # =============================================================================
 # TRIP CONTEXT - Holds all bookings and enables slot carryover
 # =============================================================================
 
-@dataclass
+# Booking intent -> TripContext attribute holding that booking
+_BOOKING_ATTR = {
+    "BOOK_FLIGHT": "flight",
+    "BOOK_ACCOMMODATION": "accommodation",
+    "BOOK_ACTIVITY": "activity",
+}
+
+@dataclass(slots=True)
 class TripContext:
     """
     Maintains context across multiple bookings.
@@ -122,12 +144,8 @@ class TripContext:
 
     def get_booking(self, intent: str):
         """Get the booking object for an intent."""
-        mapping = {
-            "BOOK_FLIGHT": self.flight,
-            "BOOK_ACCOMMODATION": self.accommodation,
-            "BOOK_ACTIVITY": self.activity,
-        }
-        return mapping.get(intent)
+        attr = _BOOKING_ATTR.get(intent)
+        return getattr(self, attr) if attr is not None else None
 
     def get_carryover_values(self, from_intent: str, to_intent: str) -> Dict[str, Any]:
         """
@@ -153,7 +171,7 @@ class TripContext:
     def mark_completed(self, intent: str) -> None:
         """Mark a booking as completed."""
         booking = self.get_booking(intent)
-        if booking and hasattr(booking, 'completed'):
+        if booking is not None:
             booking.completed = True
         if intent not in self.completed_intents:
             self.completed_intents.append(intent)
@@ -208,9 +226,19 @@ CARRYOVER_SLOTS = {
     },
 }
 
+# Same mappings indexed {from_intent: {to_intent: slot_map}}, so a lookup is
+# two string-keyed gets instead of building and hashing a tuple key
+_CARRYOVER_BY_SOURCE: Dict[str, Dict[str, Dict[str, str]]] = {}
+for (_from, _to), _slot_map in CARRYOVER_SLOTS.items():
+    _CARRYOVER_BY_SOURCE.setdefault(_from, {})[_to] = _slot_map
+del _from, _to, _slot_map
+
 def get_carryover_slots(from_intent: str, to_intent: str) -> Dict[str, str]:
     """
     Get slot mappings for carryover between two intents.
     Returns {source_slot: target_slot} dictionary.
     """
-    return CARRYOVER_SLOTS.get((from_intent, to_intent), {})
\ No newline at end of file
+    targets = _CARRYOVER_BY_SOURCE.get(from_intent)
+    if targets is None:
+        return {}
+    return targets.get(to_intent) or {}
\ No newline at end of file
@@ -1,11 +1,16 @@
+import re
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from data import TripContext
 from schema import INTENTS
 
+# Set views of the schema intents for O(1) membership checks per turn
+_INTENTS_SET = frozenset(INTENTS)
+_NON_TASK_INTENTS = frozenset({"OOD", "COMPARE_CITIES"})
 
-@dataclass
+
+@dataclass(slots=True)
 class DialogueState:
     """
     Dialogue State Tracker for multi-booking travel planner.
@@ -44,15 +49,14 @@ class DialogueState:
     def get_missing_slots(self) -> List[str]:
         """Get missing slots for the current booking."""
         booking = self.get_current_booking()
-        if booking and hasattr(booking, 'missing_slots'):
+        if booking is not None:
             return booking.missing_slots()
         return []
     
     def to_summary(self) -> Dict[str, Any]:
         """Create a summary of current state."""
         booking = self.get_current_booking()
-        booking_data = booking.to_dict() if booking else {}
-        filled_slots = {k: v for k, v in booking_data.items() if v is not None}
+        filled_slots = booking.filled_slots() if booking else {}
         
         return {
             "current_intent": self.current_intent,
@@ -72,30 +76,50 @@ class DialogueState:
 # =============================================================================
 
 # Confirmation keywords
-CONFIRM_KEYWORDS = {"yes", "yeah", "yep", "sure", "ok", "okay", "correct", "right", "confirm", "si", "sì", "affirmative", "absolutely", "definitely"}
-DENY_KEYWORDS = {"no", "nope", "nah", "wrong", "change", "cancel", "modify", "different", "incorrect", "not"}
+CONFIRM_KEYWORDS = frozenset({"yes", "yeah", "yep", "sure", "ok", "okay", "correct", "right", "confirm", "si", "sì", "affirmative", "absolutely", "definitely"})
+DENY_KEYWORDS = frozenset({"no", "nope", "nah", "wrong", "change", "cancel", "modify", "different", "incorrect", "not"})
+
+
+# Whole-word matchers built from the keyword sets; one C-level scan per check
+_CONFIRM_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(CONFIRM_KEYWORDS, key=len, reverse=True))) + r")\b",
+    re.IGNORECASE,
+)
+_DENY_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(DENY_KEYWORDS, key=len, reverse=True))) + r")\b",
+    re.IGNORECASE,
+)
 
 
 def _is_confirmation(user_text: str) -> bool:
     """Check if user utterance is a confirmation."""
-    words = set(user_text.lower().split())
-    return bool(words & CONFIRM_KEYWORDS)
+    return _CONFIRM_RE.search(user_text) is not None
 
 
 def _is_denial(user_text: str) -> bool:
     """Check if user utterance is a denial."""
-    words = set(user_text.lower().split())
-    return bool(words & DENY_KEYWORDS)
+    return _DENY_RE.search(user_text) is not None
+
+
+# Intents answered directly, before any state update (RULES 1-2)
+_INTENT_SHORTCUTS = {
+    "END_DIALOGUE": "GOODBYE",
+    "GOODBYE": "GOODBYE",
+    "OOD": "ASK_CLARIFICATION",
+}
+
+
+# Booking intent -> action emitted once that booking is confirmed
+_COMPLETE_ACTION = {
+    "BOOK_FLIGHT": "COMPLETE_FLIGHT_BOOKING",
+    "BOOK_ACCOMMODATION": "COMPLETE_ACCOMMODATION_BOOKING",
+    "BOOK_ACTIVITY": "COMPLETE_ACTIVITY_BOOKING",
+}
 
 
 def _get_complete_action(intent: str) -> str:
     """Get the completion action for an intent."""
-    mapping = {
-        "BOOK_FLIGHT": "COMPLETE_FLIGHT_BOOKING",
-        "BOOK_ACCOMMODATION": "COMPLETE_ACCOMMODATION_BOOKING",
-        "BOOK_ACTIVITY": "COMPLETE_ACTIVITY_BOOKING",
-    }
-    return mapping.get(intent, "ASK_CLARIFICATION")
+    return _COMPLETE_ACTION.get(intent, "ASK_CLARIFICATION")
 
 
 def _update_state_with_nlu(state: DialogueState, nlu_output: Dict[str, Any]) -> None:
@@ -110,7 +134,7 @@ def _update_state_with_nlu(state: DialogueState, nlu_output: Dict[str, Any]) ->
     slots = nlu_output.get("slots", {})
     
     # Skip state updates for non-booking intents
-    if intent not in INTENTS or intent in ("OOD", "COMPARE_CITIES"):
+    if intent not in _INTENTS_SET or intent in _NON_TASK_INTENTS:
         return
     
     # Check if we're switching intents
@@ -128,9 +152,7 @@ def _update_state_with_nlu(state: DialogueState, nlu_output: Dict[str, Any]) ->
     # Update slots in current booking
     booking = state.get_current_booking()
     if booking and slots:
-        for slot, value in slots.items():
-            if value is not None and hasattr(booking, slot):
-                setattr(booking, slot, value)
+        booking.update(slots)
 
 
 def dm_decide(
@@ -166,21 +188,19 @@ def dm_decide(
     """
     intent = nlu_output.get("intent")
     slots = nlu_output.get("slots", {})
-    user_text = user_utterance.lower().strip()
+    # Keyword matchers are case-insensitive, so no lowered copy is needed
+    user_text = user_utterance.strip()
     
     # =========================================================================
     # RULE 1: END_DIALOGUE intent -> GOODBYE
-    # =========================================================================
-    if intent == "END_DIALOGUE" or intent == "GOODBYE":
-        state.last_action = "GOODBYE"
-        return "GOODBYE"
-    
-    # =========================================================================
     # RULE 2: OOD or unknown/None intent -> ASK_CLARIFICATION
     # =========================================================================
-    if intent == "OOD" or intent is None or intent not in INTENTS:
-        state.last_action = "ASK_CLARIFICATION"
-        return "ASK_CLARIFICATION"
+    action = _INTENT_SHORTCUTS.get(intent)
+    if action is None and intent not in _INTENTS_SET:
+        action = "ASK_CLARIFICATION"
+    if action is not None:
+        state.last_action = action
+        return action
     
     # =========================================================================
     # SPECIAL: Handle COMPARE_CITIES (informative, no booking flow)
@@ -195,16 +215,23 @@ def dm_decide(
             state.last_action = "ASK_CLARIFICATION"
             return "ASK_CLARIFICATION"
     
+    # Classify the reply once; both handlers below read the same flags
+    awaiting_confirmation = state.last_action == "ASK_CONFIRMATION"
+    is_confirmation = is_denial = False
+    if awaiting_confirmation or state.awaiting_carryover_response:
+        is_confirmation = _is_confirmation(user_text)
+        is_denial = _is_denial(user_text)
+    
     # =========================================================================
     # HANDLE CONFIRMATION STATE (before updating state)
     # Check if we were waiting for confirmation and user responded
     # =========================================================================
-    if state.last_action == "ASK_CONFIRMATION":
-        if _is_denial(user_text):
+    if awaiting_confirmation:
+        if is_denial:
             # Negative confirmation: user wants to change something
             state.last_action = "REQUEST_SLOT_CHANGE"
             return "REQUEST_SLOT_CHANGE"
-        elif _is_confirmation(user_text):
+        elif is_confirmation:
             # Positive confirmation: mark as confirmed and proceed to completion
             state.confirmed = True
             action = _get_complete_action(state.current_intent)
@@ -217,17 +244,17 @@ def dm_decide(
     # HANDLE CARRYOVER OFFER RESPONSE
     # =========================================================================
     if state.awaiting_carryover_response:
-        if _is_confirmation(user_text):
+        if is_confirmation:
             # Apply carryover slots
             if state.pending_carryover:
                 booking = state.get_current_booking()
                 if booking:
                     for slot, value in state.pending_carryover.items():
-                        if hasattr(booking, slot):
+                        if slot in booking.SLOT_NAMES:
                             setattr(booking, slot, value)
             state.pending_carryover = None
             state.awaiting_carryover_response = False
-        elif _is_denial(user_text):
+        elif is_denial:
             # User declined carryover
             state.pending_carryover = None
             state.awaiting_carryover_response = False
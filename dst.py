@@ -1,28 +1,31 @@
 from dm import DialogueState
 from schema import INTENTS, INTENT_SLOTS, RULES
 
+# Base system prompt for normal dialogue flow. It only depends on the static
+# schema, so it is rendered once at import instead of on every turn.
+_BASE_PROMPT = (
+    "You are an NLU module for a travel booking dialogue system.\n"
+    "Task: classify the user's intent and extract slot values.\n\n"
+    f"Valid intents: {INTENTS}\n\n"
+    f"Valid slots per intent: {INTENT_SLOTS}\n\n"
+    f"{RULES}\n\n"
+    "Output MUST be a single JSON object with keys: intent, slots\n"
+    "- Put null for unknown slots.\n"
+    "- Never invent details.\n"
+    "- Only include slots relevant to the detected intent.\n"
+)
+
+# Actions after which the next user turn is a yes/no answer
+_CONFIRMATION_ACTIONS = frozenset({"ASK_CONFIRMATION", "OFFER_SLOT_CARRYOVER"})
+
 def state_context(state: DialogueState) -> str:
     """Generate a context-aware NLU system prompt based on dialogue state."""
-    
-    # Base system prompt for normal dialogue flow
-    base_prompt = (
-        "You are an NLU module for a travel booking dialogue system.\n"
-        "Task: classify the user's intent and extract slot values.\n\n"
-        f"Valid intents: {INTENTS}\n\n"
-        f"Valid slots per intent: {INTENT_SLOTS}\n\n"
-        f"{RULES}\n\n"
-        "Output MUST be a single JSON object with keys: intent, slots\n"
-        "- Put null for unknown slots.\n"
-        "- Never invent details.\n"
-        "- Only include slots relevant to the detected intent.\n"
-    )
-    
     # If no prior action, return base prompt
     if not state.last_action:
-        return base_prompt
+        return _BASE_PROMPT
     
     # Context-specific prompts based on last action
-    if state.last_action in ["ASK_CONFIRMATION", "OFFER_SLOT_CARRYOVER"]:
+    if state.last_action in _CONFIRMATION_ACTIONS:
         return (
             "You are an NLU module for a travel booking dialogue system.\n"
             "The system just asked for confirmation.\n\n"
@@ -37,7 +40,6 @@ def state_context(state: DialogueState) -> str:
         )
     
     elif state.last_action == "HANDLE_DENIAL":
-        missing = state.get_missing_slots()
         return (
             "You are an NLU module for a travel booking dialogue system.\n"
             "The user wants to modify their booking.\n\n"
@@ -63,7 +65,7 @@ def state_context(state: DialogueState) -> str:
         )
     
     # Fallback to base prompt
-    return base_prompt
+    return _BASE_PROMPT
        
 
     
@@ -6,6 +6,7 @@ from nlg import nlg_generate, GREETING_MESSAGE
 from schema import parse_action
 from amadeus import search_activities, search_accomodation
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 class Color:
     RESET = "\033[0m"
@@ -14,6 +15,20 @@ class Color:
     YELLOW = "\033[93m"
     BLUE = "\033[94m"
 
+# Runs the Amadeus search for a completed booking while NLG generates the reply
+_API_POOL = ThreadPoolExecutor(max_workers=1)
+
+# Booking completion actions, and the subset whose API results are shown
+_COMPLETE_ACTIONS = frozenset({"COMPLETE_FLIGHT_BOOKING", "COMPLETE_ACCOMMODATION_BOOKING", "COMPLETE_ACTIVITY_BOOKING"})
+_ACTIONS_WITH_RESULTS = frozenset({"COMPLETE_ACCOMMODATION_BOOKING", "COMPLETE_ACTIVITY_BOOKING"})
+
+# Hotel star ratings searched for each budget level
+_BUDGET_RATINGS = {
+    "low": "1,2",
+    "medium": "3,4",
+    "high": "5",
+}
+
 def update_state_after_action(state: DialogueState, action: str, api_results=None):
     """
     Update dialogue state after DM decision and API calls.
@@ -22,7 +37,7 @@ def update_state_after_action(state: DialogueState, action: str, api_results=Non
     base_action, _ = parse_action(action)
     
     # Handle booking completions
-    if base_action in ["COMPLETE_FLIGHT_BOOKING", "COMPLETE_ACCOMMODATION_BOOKING", "COMPLETE_ACTIVITY_BOOKING"]:
+    if base_action in _COMPLETE_ACTIONS:
         # Mark current booking as completed
         if state.current_intent:
             state.context.mark_completed(state.current_intent)
@@ -35,11 +50,11 @@ def update_state_after_action(state: DialogueState, action: str, api_results=Non
         pass  # State will be discarded anyway
 
 
-def run(debug: bool = False):
+def run(debug: bool = False, load_in_4bit: bool = False):
     if debug:
         print("------------------> DEBUG MODE ENABLED <------------------")
 
-    pipe = make_llm()
+    pipe = make_llm(load_in_4bit=load_in_4bit)
     if debug:
         if pipe is None:
             print("Error: LLM pipeline could not be created.")
@@ -87,16 +102,17 @@ def run(debug: bool = False):
             print("----------------------------------------------------------")
 
         # =========================
-        # 4) API CALLS (if needed)
+        # 4) API CALLS (if needed) - started in the background
         # =========================
-        api_results = None
+        api_future = None
+        api_label = None
         
         if base_action == "COMPLETE_FLIGHT_BOOKING":
             # Flight API calls would go here
             flight = state.context.flight
             if debug:
                 print(f"[API] Would search flights: {flight.to_dict()}")
-            # api_results = search_flights(...)
+            # api_future = _API_POOL.submit(search_flights, ...)
             pass
         
         elif base_action == "COMPLETE_ACCOMMODATION_BOOKING":
@@ -105,52 +121,54 @@ def run(debug: bool = False):
                 adults = accommodation.num_guests or 1
                 budget = accommodation.budget_level or "medium"
                 
-                ratings = {
-                    "low": "1,2",
-                    "medium": "3,4",
-                    "high": "5",
-                }.get(budget, "3,4")
+                ratings = _BUDGET_RATINGS.get(budget, "3,4")
                 
-                try:
-                    api_results = search_accomodation(
-                        city=accommodation.destination,
-                        ratings=ratings,
-                        num_adults=adults,
-                        start_date=accommodation.check_in_date,
-                        end_date=accommodation.check_out_date,
-                    )
-                except Exception as e:
-                    if debug:
-                        print(f"[API] Accommodation search failed: {e}")
+                api_label = "Accommodation"
+                api_future = _API_POOL.submit(
+                    search_accomodation,
+                    city=accommodation.destination,
+                    ratings=ratings,
+                    num_adults=adults,
+                    start_date=accommodation.check_in_date,
+                    end_date=accommodation.check_out_date,
+                )
         
         elif base_action == "COMPLETE_ACTIVITY_BOOKING":
             activity = state.context.activity
             if activity.destination:
-                try:
-                    api_results = search_activities(
-                        city=activity.destination,
-                        activity_type=activity.activity_category or "cultural",
-                    )
-                except Exception as e:
-                    if debug:
-                        print(f"[API] Activity search failed: {e}")
+                api_label = "Activity"
+                api_future = _API_POOL.submit(
+                    search_activities,
+                    city=activity.destination,
+                    activity_type=activity.activity_category or "cultural",
+                )
         
         elif base_action == "COMPARE_CITIES_RESULT":
             # Would call compare_options from amadeus.py
             pass
 
         # =========================
-        # 5) Update state after action
+        # 5) NLG - Generate response (overlaps the API round-trips)
         # =========================
-        update_state_after_action(state, action, api_results)
+        response = nlg_generate(pipe, action, state)
+
+        api_results = None
+        if api_future is not None:
+            try:
+                api_results = api_future.result()
+            except Exception as e:
+                if debug:
+                    print(f"[API] {api_label} search failed: {e}")
 
         # =========================
-        # 6) NLG - Generate response
+        # 6) Update state after action
         # =========================
-        response = nlg_generate(pipe, action, state)
+        # dm_decide already marked the booking completed, so the NLG prompt
+        # above saw the same state it would have after this call.
+        update_state_after_action(state, action, api_results)
         
         # Append API results summary if available
-        if api_results and base_action in ["COMPLETE_ACCOMMODATION_BOOKING", "COMPLETE_ACTIVITY_BOOKING"]:
+        if api_results and base_action in _ACTIONS_WITH_RESULTS:
             if isinstance(api_results, list) and len(api_results) > 0:
                 results_summary = f"\n\nHere are some options I found:\n"
                 for i, result in enumerate(api_results[:3], 1):
@@ -185,6 +203,12 @@ if __name__ == "__main__":
         action="store_true",
         help="Enable debug mode"
     )
+    parser.add_argument(
+        "--4bit",
+        dest="load_in_4bit",
+        action="store_true",
+        help="Load the model with 4-bit NF4 weights (requires bitsandbytes and a CUDA GPU)"
+    )
     args = parser.parse_args()
     
-    run(debug=args.debug)
+    run(debug=args.debug, load_in_4bit=args.load_in_4bit)
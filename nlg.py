@@ -10,6 +10,12 @@ GREETING_MESSAGE = """Hello! I'm your travel assistant. I can help you with:
 How can I help you today?
 """
 
+# Constant system turn shared by every NLG request
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a polite and helpful travel assistant. Be concise and friendly."
+}
+
 
 def nlg_generate(pipe, action: str, state: DialogueState) -> str:
     """
@@ -25,20 +31,7 @@ def nlg_generate(pipe, action: str, state: DialogueState) -> str:
         slot_param = None
 
     # Build the appropriate prompt based on action
-    prompt_builders = {
-        "REQUEST_MISSING_SLOT": _prompt_request_missing_slot,
-        "OFFER_SLOT_CARRYOVER": _prompt_offer_carryover,
-        "ASK_CONFIRMATION": _prompt_ask_confirmation,
-        "HANDLE_DENIAL": _prompt_handle_denial,
-        "COMPLETE_FLIGHT_BOOKING": _prompt_complete_flight,
-        "COMPLETE_ACCOMMODATION_BOOKING": _prompt_complete_accommodation,
-        "COMPLETE_ACTIVITY_BOOKING": _prompt_complete_activity,
-        "COMPARE_CITIES_RESULT": _prompt_compare_cities,
-        "ASK_CLARIFICATION": _prompt_ask_clarification,
-        "GOODBYE": _prompt_goodbye,
-    }
-
-    prompt_builder = prompt_builders.get(base_action, _prompt_ask_clarification)
+    prompt_builder = _PROMPT_BUILDERS.get(base_action, _prompt_ask_clarification)
     
     # Pass slot_param if action is REQUEST_MISSING_SLOT
     if base_action == "REQUEST_MISSING_SLOT" and slot_param:
@@ -47,10 +40,7 @@ def nlg_generate(pipe, action: str, state: DialogueState) -> str:
         prompt = prompt_builder(state)
 
     messages = [
-        {
-            "role": "system",
-            "content": "You are a polite and helpful travel assistant. Be concise and friendly."
-        },
+        _SYSTEM_MESSAGE,
         {
             "role": "user",
             "content": prompt
@@ -71,6 +61,14 @@ def nlg_generate(pipe, action: str, state: DialogueState) -> str:
 # PROMPT BUILDERS
 # =============================================================================
 
+# How each booking intent is referred to in the prompts
+_INTENT_NAME = {
+    "BOOK_FLIGHT": "flight",
+    "BOOK_ACCOMMODATION": "accommodation",
+    "BOOK_ACTIVITY": "activity",
+}
+_INTENT_CONTEXT = {intent: f"{name} booking" for intent, name in _INTENT_NAME.items()}
+
 def _prompt_request_missing_slot(state: DialogueState, slot_name: str = None) -> str:
     # Use provided slot_name or get first missing
     if slot_name:
@@ -82,11 +80,7 @@ def _prompt_request_missing_slot(state: DialogueState, slot_name: str = None) ->
     # Get slot description if available
     slot_description = SLOT_DESCRIPTIONS.get(slot, slot)
     
-    intent_context = {
-        "BOOK_FLIGHT": "flight booking",
-        "BOOK_ACCOMMODATION": "accommodation booking",
-        "BOOK_ACTIVITY": "activity booking",
-    }.get(state.current_intent, "request")
+    intent_context = _INTENT_CONTEXT.get(state.current_intent, "request")
 
     return f"""
 You are helping a user with their {intent_context}.
@@ -116,8 +110,7 @@ Example: "Would you like to use the same dates and number of guests from your fl
 
 def _prompt_handle_denial(state: DialogueState) -> str:
     booking = state.get_current_booking()
-    booking_data = booking.to_dict() if booking else {}
-    filled_slots = {k: v for k, v in booking_data.items() if v is not None}
+    filled_slots = booking.filled_slots() if booking else {}
     
     return f"""
 The user wants to change something in their booking.
@@ -142,16 +135,11 @@ Offer to help with booking activities in either city.
 
 def _prompt_ask_confirmation(state: DialogueState) -> str:
     booking = state.get_current_booking()
-    booking_data = booking.to_dict() if booking else {}
     
-    # Filter out None values for cleaner display
-    filled_slots = {k: v for k, v in booking_data.items() if v is not None}
+    # Only filled values, for cleaner display
+    filled_slots = booking.filled_slots() if booking else {}
     
-    intent_name = {
-        "BOOK_FLIGHT": "flight",
-        "BOOK_ACCOMMODATION": "accommodation",
-        "BOOK_ACTIVITY": "activity",
-    }.get(state.current_intent, "booking")
+    intent_name = _INTENT_NAME.get(state.current_intent, "booking")
 
     return f"""
 Summarize the following {intent_name} details and ask for confirmation.
@@ -165,8 +153,7 @@ Keep it concise but include all the details.
 
 
 def _prompt_complete_flight(state: DialogueState) -> str:
-    flight = state.context.flight.to_dict()
-    filled = {k: v for k, v in flight.items() if v is not None}
+    filled = state.context.flight.filled_slots()
     
     return f"""
 The user has confirmed their flight booking. Provide a summary and completion message.
@@ -184,8 +171,7 @@ Keep it professional but friendly.
 
 
 def _prompt_complete_accommodation(state: DialogueState) -> str:
-    accommodation = state.context.accommodation.to_dict()
-    filled = {k: v for k, v in accommodation.items() if v is not None}
+    filled = state.context.accommodation.filled_slots()
     
     return f"""
 The user has confirmed their accommodation booking. Provide a summary and completion message.
@@ -203,8 +189,7 @@ Keep it professional but friendly.
 
 
 def _prompt_complete_activity(state: DialogueState) -> str:
-    activity = state.context.activity.to_dict()
-    filled = {k: v for k, v in activity.items() if v is not None}
+    filled = state.context.activity.filled_slots()
     
     return f"""
 The user has confirmed their activity booking. Provide a summary and completion message.
@@ -255,3 +240,18 @@ Say goodbye politely.
 Thank them for using the service.
 Keep it brief and friendly.
 """
+
+
+# Action -> prompt builder used by nlg_generate
+_PROMPT_BUILDERS = {
+    "REQUEST_MISSING_SLOT": _prompt_request_missing_slot,
+    "OFFER_SLOT_CARRYOVER": _prompt_offer_carryover,
+    "ASK_CONFIRMATION": _prompt_ask_confirmation,
+    "HANDLE_DENIAL": _prompt_handle_denial,
+    "COMPLETE_FLIGHT_BOOKING": _prompt_complete_flight,
+    "COMPLETE_ACCOMMODATION_BOOKING": _prompt_complete_accommodation,
+    "COMPLETE_ACTIVITY_BOOKING": _prompt_complete_activity,
+    "COMPARE_CITIES_RESULT": _prompt_compare_cities,
+    "ASK_CLARIFICATION": _prompt_ask_clarification,
+    "GOODBYE": _prompt_goodbye,
+}
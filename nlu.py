@@ -2,38 +2,45 @@ import json
 import re
 from typing import Any, Dict, List, Optional
 
-from schema import INTENTS, INTENT_SLOTS, RULES
+from schema import INTENTS, INTENT_SLOTS
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used instead
+    orjson = None
+
+# Set view of the schema intents for O(1) validation of the parsed intent
+_INTENTS_SET = frozenset(INTENTS)
+
+# Shared decoder for pulling the first JSON object out of LLM output
+_JSON_DECODER = json.JSONDecoder()
+
+# Markdown code fence openers (``` or ```json) stripped from LLM output
+_CODE_FENCE_RE = re.compile(r"```(?:json)?")
 
 def extract_json(text: str) -> Optional[Dict[str, Any]]:
     """Return a JSON object extracted from text, or None if not found."""
     # Remove markdown code fences if present
-    text = re.sub(r"```(?:json)?", "", text)
+    text = _CODE_FENCE_RE.sub("", text)
     text = text.replace("```", "").strip()
 
     start = text.find("{")
     if start == -1:
         return None
 
-    depth = 0
-    end = None
-    for i in range(start, len(text)):
-        c = text[i]
-        if c == "{":
-            depth += 1
-        elif c == "}":
-            depth -= 1
-            if depth == 0:
-                end = i + 1
-                break
-
-    if end is None:
-        return None
+    # Common case: the reply is just the object, so decode the tail whole
+    if orjson is not None:
+        try:
+            return orjson.loads(text[start:])
+        except orjson.JSONDecodeError:
+            pass
 
-    candidate = text[start:end]
+    # Decode the first object in place; raw_decode stops at its closing brace
     try:
-        return json.loads(candidate)
+        obj, _ = _JSON_DECODER.raw_decode(text, start)
     except json.JSONDecodeError:
         return None
+    return obj
 
 def _get_last_assistant(dialogue_history: Optional[List[Dict[str, str]]]) -> str:
     """Return the last assistant message from dialogue history."""
@@ -95,7 +102,7 @@ def nlu_parse(
         return {"intent": "OOD", "slots": {}}
 
     intent = parsed.get("intent", "OOD")
-    if intent not in INTENTS:
+    if not isinstance(intent, str) or intent not in _INTENTS_SET:
         intent = "OOD"
     
     raw_slots = parsed.get("slots", {}) or {}
@@ -137,7 +137,7 @@ RULES = _build_rules()
 
 def get_json_schema_hint(intent: str) -> dict:
     """Generate a JSON schema hint for NLU output."""
-    slots = INTENT_SCHEMAS.get(intent, {}).get("slots", [])
+    slots = INTENT_SLOTS.get(intent, ())
     return {
         "intent": intent,
         "slots": {slot: None for slot in slots},